@@ -13,9 +13,13 @@ Fixes:
 """
 
 import argparse
+import copy
+import functools
+import graphlib
 import json
 import logging
 import os
+import re
 import shutil
 import sys
 import unicodedata
@@ -25,13 +29,22 @@ from typing import List, Optional, Tuple
 import trio
 import trio_parallel
 
+from fontTools.misc.fixedTools import floatToFixed
 from fontTools.otlLib.builder import buildAnchor, buildMarkBasePos
 from fontTools.pens.recordingPen import DecomposingRecordingPen, RecordingPen
 from fontTools.pens.t2CharStringPen import T2CharStringPen
 from fontTools.pens.ttGlyphPen import TTGlyphPen
 from fontTools.ttLib import TTFont
 from fontTools.ttLib.tables import otTables, ttProgram
-from gftools.fix import fix_font as gftools_fix_font
+from fontTools.ttLib.tables._n_a_m_e import makeName
+from gftools.fix import (
+    fix_colr_font,
+    fix_fvar_instances,
+    fix_hhea_caret_slope_run,
+    fix_hinted_font,
+    fix_no_varpsname,
+    fix_unhinted_font,
+)
 
 from autokern import add_auto_kerning
 
@@ -47,6 +60,42 @@ TARGET_HHEA_ASCENDER = 1015  # Mildly increase total height for looser leading
 TARGET_HHEA_DESCENDER = -265  # Mildly increase total height for looser leading
 TARGET_HHEA_LINE_GAP = 0  # Keep gap at zero for GF compliance
 
+# Output filenames use GF weight spellings (e.g. "ExtraBold" -> "Extrabold")
+FILENAME_NORMALIZATION = {"ExtraBold": "Extrabold", "ExtraLight": "Extralight", "SemiBold": "Semibold"}
+_FILENAME_NORMALIZATION_RE = re.compile("|".join(map(re.escape, FILENAME_NORMALIZATION)))
+
+# Weight names as they appear in Iosevka file names (first substring match wins)
+WEIGHT_NAME_SEARCH_ORDER = ("Heavy", "Light", "Medium", "Bold", "Thin", "ExtraLight", "SemiBold", "ExtraBold", "Black")
+
+# Map weight names to weight class values
+WEIGHT_NAME_TO_CLASS = {
+    "Thin": 100,
+    "ExtraLight": 200,
+    "Light": 300,
+    "Medium": 500,
+    "SemiBold": 600,
+    "Bold": 700,
+    "ExtraBold": 800,
+    "Black": 900,
+    "Heavy": 900,
+}
+
+# GF display/style names per weight class
+WEIGHT_CLASS_NAMES = {
+    100: ("Thin", "thin"),
+    200: ("Extralight", "extralight"),
+    300: ("Light", "light"),
+    400: ("Regular", "regular"),
+    500: ("Medium", "medium"),
+    600: ("Semibold", "semibold"),
+    700: ("Bold", "bold"),
+    800: ("Extrabold", "extrabold"),
+    900: ("Heavy", "heavy"),
+}
+
+# Raw name-record spellings of "fontbakery" (Mac Roman / UTF-16-BE)
+_FONTBAKERY_PATTERNS = (b"fontbakery", "fontbakery".encode("utf-16-be"))
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -86,6 +135,51 @@ def load_gf_version() -> dict:
 # ----------------------------------------------------------------------------
 
 
+def _stale_names(name_table, names: dict) -> dict:
+    """Return the entries of names whose record is missing or holds other text.
+
+    Records are compared against the encoded target, so ones that already
+    match are never decoded.
+    """
+    pending = dict(names)
+    stale = {}
+    for record in name_table.names:
+        key = (record.nameID, record.platformID, record.platEncID, record.langID)
+        text = pending.pop(key, None)
+        if text is None:
+            continue
+        raw = record.string
+        encoding = record.getEncoding()
+        if isinstance(raw, str) or encoding is None:
+            matches = record.toUnicode() == text
+        else:
+            try:
+                matches = raw == text.encode(encoding)
+            except UnicodeEncodeError:
+                matches = False
+        if not matches:
+            stale[key] = text
+    stale.update(pending)
+    return stale
+
+
+def _set_names(name_table, names: dict) -> None:
+    """Apply {(nameID, platformID, platEncID, langID): string} in one pass.
+
+    Equivalent to calling name_table.setName for each entry, without
+    rescanning the table per call.
+    """
+    pending = dict(names)
+    if not pending:
+        return
+    for record in name_table.names:
+        key = (record.nameID, record.platformID, record.platEncID, record.langID)
+        if key in pending:
+            record.string = pending.pop(key)
+    for key, string in pending.items():
+        name_table.names.append(makeName(string, *key))
+
+
 def fix_font_revision(font: TTFont) -> bool:
     """Fix font revision, nameID3, and nameID5 to the Google Fonts compliant version.
 
@@ -100,20 +194,29 @@ def fix_font_revision(font: TTFont) -> bool:
     gf_version_str = ver["gf_version"]
     version_string = ver["gf_version_string"]
 
-    font["head"].fontRevision = gf_version
     name_table = font["name"]
 
-    # ID 5: Version string
-    name_table.setName(version_string, 5, 3, 1, 0x409)
-    name_table.setName(version_string, 5, 1, 0, 0)
-
     # ID 3: Unique identifier — format: "version;vendorID;PostScriptName"
     vendor_id = font["OS/2"].achVendID.strip() if "OS/2" in font else "UKWN"
     ps_name_rec = name_table.getName(6, 3, 1, 0x409)
     ps_name = ps_name_rec.toUnicode() if ps_name_rec else "Unknown"
     unique_id = f"{gf_version_str};{vendor_id};{ps_name}"
-    name_table.setName(unique_id, 3, 3, 1, 0x409)
-    name_table.setName(unique_id, 3, 1, 0, 0)
+
+    targets = {
+        (5, 3, 1, 0x409): version_string,
+        (5, 1, 0, 0): version_string,
+        (3, 3, 1, 0x409): unique_id,
+        (3, 1, 0, 0): unique_id,
+    }
+    # head stores fontRevision as 16.16 fixed, so compare at that precision
+    revision_current = floatToFixed(font["head"].fontRevision, 16) == floatToFixed(gf_version, 16)
+    if revision_current and not _stale_names(name_table, targets):
+        return False
+
+    font["head"].fontRevision = gf_version
+
+    # ID 5 (version string) and ID 3 (unique ID) on both platforms
+    _set_names(name_table, targets)
 
     logger.info(f"  ✓ Fixed font revision: {gf_version} ({version_string})")
     logger.info(f"  ✓ Fixed unique ID (ID 3): {unique_id}")
@@ -125,8 +228,14 @@ def fix_copyright_notice(font: TTFont) -> bool:
     name_table = font["name"]
     copyright_notice = "Copyright 2015-2025 The Iosevka Project Authors (https://github.com/be5invis/Iosevka)"
 
-    name_table.setName(copyright_notice, 0, 3, 1, 0x409)
-    name_table.setName(copyright_notice, 0, 1, 0, 0)
+    stale = _stale_names(
+        name_table,
+        {(0, 3, 1, 0x409): copyright_notice, (0, 1, 0, 0): copyright_notice},
+    )
+    if not stale:
+        return False
+
+    _set_names(name_table, stale)
 
     logger.info(f"  ✓ Fixed copyright notice: {copyright_notice}")
     return True
@@ -134,6 +243,10 @@ def fix_copyright_notice(font: TTFont) -> bool:
 
 def fix_windows_metrics(font: TTFont) -> bool:
     """Fix Windows ascent/descent to proper values for Google Fonts"""
+    os2 = font["OS/2"]
+    if os2.usWinAscent == TARGET_WIN_ASCENT and os2.usWinDescent == TARGET_WIN_DESCENT:
+        return False
+
     font["OS/2"].usWinAscent = TARGET_WIN_ASCENT
     font["OS/2"].usWinDescent = TARGET_WIN_DESCENT
 
@@ -143,6 +256,19 @@ def fix_windows_metrics(font: TTFont) -> bool:
 
 def fix_vertical_metrics(font: TTFont) -> bool:
     """Fix hhea vertical metrics for Google Fonts"""
+    hhea, os2 = font["hhea"], font["OS/2"]
+    current = (
+        hhea.ascender,
+        hhea.descender,
+        hhea.lineGap,
+        os2.sTypoAscender,
+        os2.sTypoDescender,
+        os2.sTypoLineGap,
+    )
+    target = (TARGET_HHEA_ASCENDER, TARGET_HHEA_DESCENDER, TARGET_HHEA_LINE_GAP) * 2
+    if current == target and os2.fsSelection & (1 << 7):
+        return False
+
     font["hhea"].ascender = TARGET_HHEA_ASCENDER
     font["hhea"].descender = TARGET_HHEA_DESCENDER
     font["hhea"].lineGap = TARGET_HHEA_LINE_GAP
@@ -155,12 +281,12 @@ def fix_vertical_metrics(font: TTFont) -> bool:
     # Enable USE_TYPO_METRICS flag (bit 7)
     font["OS/2"].fsSelection |= 1 << 7
 
-    total_height = font["hhea"].ascender - font["hhea"].descender + font["hhea"].lineGap
+    total_height = TARGET_HHEA_ASCENDER - TARGET_HHEA_DESCENDER + TARGET_HHEA_LINE_GAP
     logger.info(
-        f"  ✓ Fixed hhea metrics: ascender={font['hhea'].ascender}, "
-        f"descender={font['hhea'].descender}, lineGap={font['hhea'].lineGap}, total={total_height}"
+        f"  ✓ Fixed hhea/Typo metrics: ascender={TARGET_HHEA_ASCENDER}, "
+        f"descender={TARGET_HHEA_DESCENDER}, lineGap={TARGET_HHEA_LINE_GAP}, total={total_height} "
+        "(USE_TYPO_METRICS enabled)"
     )
-    logger.info("  ✓ Fixed Typo metrics to match hhea (USE_TYPO_METRICS enabled)")
     return True
 
 
@@ -169,6 +295,12 @@ def flatten_nested_components(font: TTFont) -> bool:
     if "glyf" not in font:
         return False
 
+    # maxp records the deepest component nesting; a depth of 1 or less means
+    # no composite references another, e.g. on an already-flattened font.
+    depth = getattr(font["maxp"], "maxComponentDepth", None)
+    if depth is not None and depth <= 1:
+        return False
+
     from fontTools.ttLib.tables._g_l_y_f import (
         NON_OVERLAPPING,
         OVERLAP_COMPOUND,
@@ -176,7 +308,6 @@ def flatten_nested_components(font: TTFont) -> bool:
         SCALED_COMPONENT_OFFSET,
         UNSCALED_COMPONENT_OFFSET,
         USE_MY_METRICS,
-        GlyphComponent,
     )
 
     glyf = font["glyf"]
@@ -191,66 +322,102 @@ def flatten_nested_components(font: TTFont) -> bool:
         | NON_OVERLAPPING
     )
 
+    # Leaf components of each composite, relative to that composite. Filled
+    # leaves-first, so expanding a component only ever reads a finished entry
+    # and shared accents are expanded once for every parent that places them.
+    flat_cache = {}
+
     def expand_component(component):
-        target = glyf.get(component.glyphName)
-        if target and target.isComposite():
+        if component.glyphName in composite_set:
+            # Points map as p' = p · T + offset, so an inner component's
+            # transform composes as T_inner · T_outer and its offset is
+            # carried through T_outer.
+            outer = getattr(component, "transform", None)
             expanded = []
-            for child in target.components:
-                for inner in expand_component(child):
-                    new_comp = GlyphComponent()
-                    new_comp.glyphName = inner.glyphName
-                    new_comp.x = getattr(inner, 'x', 0) + getattr(component, 'x', 0)
-                    new_comp.y = getattr(inner, 'y', 0) + getattr(component, 'y', 0)
-                    new_comp.flags = inner.flags | (component.flags & flag_mask)
-                    expanded.append(new_comp)
+            for inner in flat_cache[component.glyphName]:
+                new_comp = copy.copy(inner)
+                x, y = getattr(inner, 'x', 0), getattr(inner, 'y', 0)
+                if outer is not None:
+                    x, y = (
+                        x * outer[0][0] + y * outer[1][0],
+                        x * outer[0][1] + y * outer[1][1],
+                    )
+                    t = getattr(inner, "transform", None) or [[1, 0], [0, 1]]
+                    new_comp.transform = [
+                        [
+                            t[row][0] * outer[0][col] + t[row][1] * outer[1][col]
+                            for col in range(2)
+                        ]
+                        for row in range(2)
+                    ]
+                new_comp.x = x + getattr(component, 'x', 0)
+                new_comp.y = y + getattr(component, 'y', 0)
+                new_comp.flags = inner.flags | (component.flags & flag_mask)
+                expanded.append(new_comp)
             return expanded
 
-        simple = GlyphComponent()
-        simple.glyphName = component.glyphName
+        simple = copy.copy(component)
         simple.x = getattr(component, 'x', 0)
         simple.y = getattr(component, 'y', 0)
         simple.flags = component.flags & flag_mask
         return [simple]
 
-    for glyph_name in font.getGlyphOrder():
-        glyph = glyf[glyph_name]
-        if not glyph.isComposite():
-            continue
+    # isComposite() reads a still-packed glyph's header without decompiling it
+    composite_names = [name for name in font.getGlyphOrder() if glyf.glyphs[name].isComposite()]
+    composite_set = set(composite_names)
 
-        component_names = glyph.getComponentNames(glyf)
-        has_nested = any(
-            (name in glyf and glyf[name].isComposite()) for name in component_names
-        )
-        if not has_nested:
-            continue
+    nested = {
+        name: {c.glyphName for c in glyf[name].components if c.glyphName in composite_set}
+        for name in composite_names
+    }
+    for name in graphlib.TopologicalSorter(nested).static_order():
+        flat_cache[name] = [
+            leaf for child in glyf[name].components for leaf in expand_component(child)
+        ]
 
-        new_components = []
-        for component in glyph.components:
-            new_components.extend(expand_component(component))
+    for glyph_name in composite_names:
+        if not nested[glyph_name]:
+            continue
 
-        glyph.components = new_components
+        glyph = glyf[glyph_name]
+        glyph.components = flat_cache[glyph_name]
         glyph.recalcBounds(glyf)
         flattened.append(glyph_name)
 
     if flattened:
-        print(f"  ✓ Flattened {len(flattened)} glyphs with nested components")
+        logger.info(f"  ✓ Flattened {len(flattened)} glyphs with nested components")
 
     return bool(flattened)
 
 
+def _mentions_fontbakery(record) -> bool:
+    """Check a name record for "fontbakery", decoding only likely matches."""
+    raw = record.string
+    if isinstance(raw, bytes):
+        lowered = raw.lower()
+        if not any(pattern in lowered for pattern in _FONTBAKERY_PATTERNS):
+            return False
+    return "fontbakery" in record.toUnicode().lower()
+
+
 def fix_fontbakery_version(font: TTFont) -> bool:
     """Update or remove fontbakery version metadata."""
     name_table = font["name"]
 
     # Check manufacturer/description fields that might have fontbakery refs
-    for name_id in [8, 9, 10]:  # Manufacturer, Designer, Description
-        for record in list(name_table.names):
-            if record.nameID == name_id:
-                value = record.toUnicode()
-                if "fontbakery" in value.lower():
-                    name_table.names.remove(record)
-                    logger.info(f"  ✓ Removed fontbakery reference from nameID {name_id}")
+    stale = [
+        record
+        for record in name_table.names
+        # Manufacturer, Designer, Description
+        if record.nameID in (8, 9, 10) and _mentions_fontbakery(record)
+    ]
+    if not stale:
+        return False
 
+    stale_ids = {id(record) for record in stale}
+    name_table.names = [record for record in name_table.names if id(record) not in stale_ids]
+    for record in stale:
+        logger.info(f"  ✓ Removed fontbakery reference from nameID {record.nameID}")
     return True
 
 
@@ -274,25 +441,28 @@ def fix_zero_width_glyphs(font: TTFont) -> bool:
         "uniEF0C",
     }
 
+    metrics = hmtx.metrics
+
     # Get the standard width for this font (monospaced)
-    if "space" in hmtx.metrics:
-        new_width = hmtx["space"][0]
+    space_metrics = metrics.get("space")
+    if space_metrics is not None:
+        new_width = space_metrics[0]
     else:
         # Fallback to average width
-        widths = [w for w, _ in hmtx.metrics.values() if w > 0]
+        widths = [w for w, _ in metrics.values() if w > 0]
         new_width = sum(widths) // len(widths) if widths else 500
 
-    glyph_order = font.getGlyphOrder()
+    # Only zero-width glyphs are candidates, so filter on the metrics first
+    # and leave every other glyph undecompiled.
+    zero_width_names = [name for name, (width, _) in metrics.items() if width == 0 and name in glyf]
+    if not zero_width_names:
+        return False
+
     gdef = font.get("GDEF")
     glyph_class_def = gdef.table.GlyphClassDef if gdef and gdef.table else None
 
-    for glyph_name in glyph_order:
-        if glyph_name not in glyf:
-            continue
-
-        width, lsb = hmtx[glyph_name]
-        if width != 0:
-            continue
+    for glyph_name in zero_width_names:
+        lsb = metrics[glyph_name][1]
 
         # Skip true combining marks; they are intentionally zero-width.
         is_combining = False
@@ -314,11 +484,7 @@ def fix_zero_width_glyphs(font: TTFont) -> bool:
         is_pua_glyph = glyph_name in pua_glyphs_to_fix
 
         # Check if it has contours (not just a composite or empty)
-        has_contours = (
-            hasattr(glyph, "numberOfContours")
-            and glyph.numberOfContours is not None
-            and glyph.numberOfContours != 0
-        )
+        has_contours = bool(getattr(glyph, "numberOfContours", 0))
 
         # Fix if it's a PUA glyph or has contours but no width
         if is_pua_glyph or (has_contours and not glyph.isComposite()):
@@ -327,16 +493,16 @@ def fix_zero_width_glyphs(font: TTFont) -> bool:
 
     if fixed:
         logger.info(f"  ✓ Fixed zero-width glyphs: {', '.join(fixed)}")
-        # Update hhea.advanceWidthMax if needed
-        max_width = max((w for w, _ in hmtx.metrics.values()), default=0)
-        if max_width > font["hhea"].advanceWidthMax:
-            font["hhea"].advanceWidthMax = max_width
-            logger.info(f"  ✓ Updated hhea.advanceWidthMax to {max_width}")
+        # Update hhea.advanceWidthMax if needed; only the fixed glyphs changed
+        # and they all received new_width.
+        if new_width > font["hhea"].advanceWidthMax:
+            font["hhea"].advanceWidthMax = new_width
+            logger.info(f"  ✓ Updated hhea.advanceWidthMax to {new_width}")
         return True
     return False
 
 
-def fix_font_names(font: TTFont) -> bool:
+def fix_font_names(font: TTFont, font_path: Path) -> bool:
     """Fix font names to match Google Fonts requirements."""
     name_table = font["name"]
     is_italic = bool(font["head"].macStyle & 2) or (font["OS/2"].fsSelection & 1)
@@ -344,51 +510,25 @@ def fix_font_names(font: TTFont) -> bool:
     existing_family = name_table.getName(1, 3, 1, 0x409)
     family_hint = existing_family.toUnicode() if existing_family else ""
 
-    # Get file name safely from the reader
-    file_path = Path(font.reader.file.name)
-    is_mono = "Mono" in family_hint or "Mono" in file_path.name
+    # The source file name carries the family variant and weight
+    is_mono = "Mono" in family_hint or "Mono" in font_path.name
     base_family = "Iosevka Charon Mono" if is_mono else "Iosevka Charon"
 
     # Detect weight from file name (more reliable than current OS/2 weight class)
-    file_stem = file_path.stem
+    file_stem = font_path.stem
     weight_from_name = None
-    weights = ["Heavy", "Light", "Medium", "Bold", "Thin", "ExtraLight", "SemiBold", "ExtraBold", "Black"]
-    for w in weights:
+    for w in WEIGHT_NAME_SEARCH_ORDER:
         if w in file_stem:
             weight_from_name = w
             break
 
-    # Map weight names to weight class values
-    weight_name_to_class = {
-        "Thin": 100,
-        "ExtraLight": 200,
-        "Light": 300,
-        "Medium": 500,
-        "SemiBold": 600,
-        "Bold": 700,
-        "ExtraBold": 800,
-        "Black": 900,
-        "Heavy": 900,
-    }
-
     # Determine actual weight class from file name or existing value
     if weight_from_name:
-        weight_class = weight_name_to_class.get(weight_from_name, 400)
+        weight_class = WEIGHT_NAME_TO_CLASS.get(weight_from_name, 400)
     else:
         weight_class = font["OS/2"].usWeightClass
 
-    weight_map = {
-        100: ("Thin", "thin"),
-        200: ("Extralight", "extralight"),
-        300: ("Light", "light"),
-        400: ("Regular", "regular"),
-        500: ("Medium", "medium"),
-        600: ("Semibold", "semibold"),
-        700: ("Bold", "bold"),
-        800: ("Extrabold", "extrabold"),
-        900: ("Heavy", "heavy"),
-    }
-    weight_display, _ = weight_map.get(weight_class, ("Regular", "regular"))
+    weight_display, _ = WEIGHT_CLASS_NAMES.get(weight_class, ("Regular", "regular"))
 
     # RIBBI logic
     is_ribbi = (weight_class in (400, 700)) and (weight_class == 400 or is_italic or weight_class == 700)
@@ -424,29 +564,44 @@ def fix_font_names(font: TTFont) -> bool:
 
     ps_name = f"{base_family.replace(' ', '')}-{ps_suffix}"
 
+    changed = False
+
     # Set correct OS/2 usWeightClass
-    font["OS/2"].usWeightClass = weight_class
+    if font["OS/2"].usWeightClass != weight_class:
+        font["OS/2"].usWeightClass = weight_class
+        changed = True
 
     # Set name IDs (3.1.1033 is Windows/English)
-    name_table.setName(family_name, 1, 3, 1, 0x409)
-    name_table.setName(subfamily_name, 2, 3, 1, 0x409)
-    name_table.setName(full_name, 4, 3, 1, 0x409)
-    name_table.setName(ps_name, 6, 3, 1, 0x409)
+    names = {
+        (1, 3, 1, 0x409): family_name,
+        (2, 3, 1, 0x409): subfamily_name,
+        (4, 3, 1, 0x409): full_name,
+        (6, 3, 1, 0x409): ps_name,
+    }
 
     if typographic_family is None:
-        name_table.names = [n for n in name_table.names if n.nameID not in (16, 17)]
+        kept = [n for n in name_table.names if n.nameID not in (16, 17)]
+        if len(kept) != len(name_table.names):
+            name_table.names = kept
+            changed = True
     else:
-        name_table.setName(typographic_family, 16, 3, 1, 0x409)
-        name_table.setName(typographic_subfamily, 17, 3, 1, 0x409)
+        names[(16, 3, 1, 0x409)] = typographic_family
+        names[(17, 3, 1, 0x409)] = typographic_subfamily
 
     # Mirror to Mac platform (1.0.0 is Mac/English)
-    name_table.setName(family_name, 1, 1, 0, 0)
-    name_table.setName(subfamily_name, 2, 1, 0, 0)
-    name_table.setName(full_name, 4, 1, 0, 0)
-    name_table.setName(ps_name, 6, 1, 0, 0)
+    names[(1, 1, 0, 0)] = family_name
+    names[(2, 1, 0, 0)] = subfamily_name
+    names[(4, 1, 0, 0)] = full_name
+    names[(6, 1, 0, 0)] = ps_name
     if typographic_family:
-        name_table.setName(typographic_family, 16, 1, 0, 0)
-        name_table.setName(typographic_subfamily, 17, 1, 0, 0)
+        names[(16, 1, 0, 0)] = typographic_family
+        names[(17, 1, 0, 0)] = typographic_subfamily
+
+    stale = _stale_names(name_table, names)
+    if not (stale or changed):
+        return False
+
+    _set_names(name_table, stale)
 
     logger.info(f"  ✓ Fixed font names: {full_name} (ps: {ps_name})")
     return True
@@ -454,12 +609,13 @@ def fix_font_names(font: TTFont) -> bool:
 
 def fix_dotted_circle(font: TTFont) -> bool:
     """Ensure dotted circle glyph exists and has proper marks."""
-    cmap = font.getBestCmap()
-    if 0x25CC not in cmap:
+    unicode_tables = [table for table in font["cmap"].tables if table.isUnicode()]
+    if not any(0x25CC in table.cmap for table in unicode_tables):
         # Try to find space or period to use as placeholder
+        glyph_ids = font.getReverseGlyphMap()
         for placeholder in ["space", "period", "uni00A0"]:
-            if placeholder in font["glyf"]:
-                for table in font["cmap"].tables:
+            if placeholder in glyph_ids:
+                for table in unicode_tables:
                     table.cmap[0x25CC] = placeholder
                 logger.info(f"  ✓ Added Dotted Circle (U+25CC) pointing to {placeholder} glyph")
                 return True
@@ -608,13 +764,18 @@ def fix_broken_mark_anchors(font: TTFont) -> bool:
     return False
 
 
+@functools.lru_cache(maxsize=None)
+def _is_combining(cp: int) -> bool:
+    """Memoized combining check; worker processes reuse it across fonts."""
+    return unicodedata.combining(chr(cp)) != 0
+
+
 def add_fallback_mark_anchors(font: TTFont) -> bool:
     """Add broad mark-to-base coverage so combining marks attach instead of floating."""
     if "GPOS" not in font or "glyf" not in font:
         return False
 
     cmap = font.getBestCmap()
-    glyph_for_cp = {cp: name for cp, name in cmap.items()}
 
     # Quick classifier for mark direction
     below_classes = {202, 214, 218, 220, 222, 223, 224, 225, 226}
@@ -628,26 +789,26 @@ def add_fallback_mark_anchors(font: TTFont) -> bool:
             return 2  # overlay
         return 0  # above
 
-    # Collect combining marks present in the font.
+    # Partition mapped glyphs into combining marks and bases in one pass.
     mark_glyphs = []
-    for cp, name in sorted(glyph_for_cp.items()):
-        if unicodedata.combining(chr(cp)):
+    mapped_bases = []
+    for cp, name in sorted(cmap.items()):
+        if _is_combining(cp):
             mark_glyphs.append((name, cp))
+        else:
+            mapped_bases.append(name)
 
     if not mark_glyphs:
         return False
 
     # Collect base glyphs (non-marks) present in the font.
-    base_glyphs = []
     mark_glyph_names = {name for name, _ in mark_glyphs}
+    base_glyphs = [name for name in mapped_bases if name not in mark_glyph_names]
 
-    for cp, name in sorted(glyph_for_cp.items()):
-        if not unicodedata.combining(chr(cp)) and name not in mark_glyph_names:
-            base_glyphs.append(name)
-
+    mapped_names = set(cmap.values())
     glyf_table = font["glyf"]
     for glyph_name in font.getGlyphOrder():
-        if glyph_name not in glyph_for_cp.values() and glyph_name not in mark_glyph_names:
+        if glyph_name not in mapped_names and glyph_name not in mark_glyph_names:
             if glyph_name in glyf_table:
                 base_glyphs.append(glyph_name)
 
@@ -655,12 +816,15 @@ def add_fallback_mark_anchors(font: TTFont) -> bool:
     hmtx = font["hmtx"]
 
     gpos_table = font["GPOS"].table
+    mark_records = []
+    if gpos_table.FeatureList:
+        mark_records = [r for r in gpos_table.FeatureList.FeatureRecord if r.FeatureTag == "mark"]
+
     existing_mark_glyphs = set()
     if gpos_table.FeatureList and gpos_table.LookupList:
         mark_lookup_indices = set()
-        for record in gpos_table.FeatureList.FeatureRecord:
-            if record.FeatureTag == "mark":
-                mark_lookup_indices.update(record.Feature.LookupListIndex)
+        for record in mark_records:
+            mark_lookup_indices.update(record.Feature.LookupListIndex)
         for idx in sorted(mark_lookup_indices):
             if idx >= len(gpos_table.LookupList.Lookup):
                 continue
@@ -719,22 +883,35 @@ def add_fallback_mark_anchors(font: TTFont) -> bool:
     if not mark_anchors:
         return False
 
+    # Bases in a monospaced font mostly share x (and often y), so reuse
+    # one Anchor per distinct position.
+    anchor_cache = {}
+
+    def anchor_at(x: int, y: int):
+        anchor = anchor_cache.get((x, y))
+        if anchor is None:
+            anchor = anchor_cache[(x, y)] = buildAnchor(x, y)
+        return anchor
+
+    gaps = {cls: class_gap(cls) for cls in mark_classes_present}
     base_anchors = {}
+    metrics = hmtx.metrics
     for base in base_glyphs:
-        if base not in glyf or base not in hmtx.metrics:
+        base_metrics = metrics.get(base)
+        if base_metrics is None or base not in glyf:
             continue
         glyph = glyf[base]
         if not hasattr(glyph, "xMax") or glyph.xMax is None:
             glyph.recalcBounds(glyf)
-        advance, _ = hmtx[base]
+        advance = base_metrics[0]
         x = advance // 2
         anchors_for_base = {}
         if 0 in mark_classes_present:
-            anchors_for_base[0] = buildAnchor(x, glyph.yMax + class_gap(0))
+            anchors_for_base[0] = anchor_at(x, glyph.yMax + gaps[0])
         if 1 in mark_classes_present:
-            anchors_for_base[1] = buildAnchor(x, glyph.yMin - class_gap(1))
+            anchors_for_base[1] = anchor_at(x, glyph.yMin - gaps[1])
         if 2 in mark_classes_present:
-            anchors_for_base[2] = buildAnchor(x, (glyph.yMin + glyph.yMax) // 2)
+            anchors_for_base[2] = anchor_at(x, (glyph.yMin + glyph.yMax) // 2)
         if anchors_for_base:
             base_anchors[base] = anchors_for_base
 
@@ -752,10 +929,10 @@ def add_fallback_mark_anchors(font: TTFont) -> bool:
     gpos_table.LookupList.LookupCount += 1
     new_index = len(gpos_table.LookupList.Lookup) - 1
 
-    for record in gpos_table.FeatureList.FeatureRecord:
-        if record.FeatureTag == "mark":
-            record.Feature.LookupListIndex.append(new_index)
-            break
+    if mark_records:
+        # new_index is the highest lookup index, so appending keeps the
+        # list ascending.
+        mark_records[0].Feature.LookupListIndex.append(new_index)
     else:
         feature = otTables.FeatureRecord()
         feature.FeatureTag = "mark"
@@ -808,7 +985,9 @@ def add_dotted_circle_fallback(font: TTFont) -> bool:
         return False
 
     mark_class_index = 0
-    mark_anchors = {name: (mark_class_index, buildAnchor(0, 0)) for name in missing}
+    # Anchors are plain values, so every mark can share one instance
+    zero_anchor = buildAnchor(0, 0)
+    mark_anchors = {name: (mark_class_index, zero_anchor) for name in missing}
 
     glyph = glyf[dotted]
     if not hasattr(glyph, "xMax") or glyph.xMax is None:
@@ -845,19 +1024,63 @@ def normalize_simple_glyphs(font: TTFont) -> bool:
     glyf = font["glyf"]
     changed = False
 
-    for name in font.getGlyphOrder():
-        glyph = glyf[name]
-        if glyph.isComposite() or glyph.numberOfContours in (0, None):
+    def is_canonical(glyph):
+        # Decompiled flags only keep on-curve/overlap/cubic bits; TTGlyphPen
+        # emits bare on-curve flags, starts each contour on an on-curve
+        # point, drops single-point contours and a closing point that
+        # repeats the start.
+        flags = glyph.flags
+        # Deleting the 0x00/0x01 bytes leaves anything carrying another bit.
+        if bytes(flags).translate(None, b"\x00\x01"):
+            return False
+        coords = glyph.coordinates
+        start = 0
+        for end in glyph.endPtsOfContours:
+            if end <= start or not flags[start]:
+                return False
+            if flags[end] and coords[end] == coords[start]:
+                return False
+            start = end + 1
+        return True
+
+    # One pen serves every glyph: TTGlyphPen.glyph() resets it after building.
+    pen = TTGlyphPen(glyf)
+
+    for name, glyph in list(glyf.glyphs.items()):
+        if glyph.isComposite():
+            continue
+        glyph.expand(glyf)
+        if glyph.numberOfContours in (0, None):
             continue
 
-        pen = TTGlyphPen(glyf)
-        glyph.draw(pen, glyf)
-        new_glyph = pen.glyph()
-        # Drop any existing instructions to avoid stale programs.
-        new_glyph.program = ttProgram.Program()
-        new_glyph.recalcBounds(glyf)
-        glyf[name] = new_glyph
-        changed = True
+        if not is_canonical(glyph):
+            glyph.draw(pen, glyf)
+            new_glyph = pen.glyph()
+            # Contours made only of off-curve points fail is_canonical but
+            # come back from the pen unchanged; those are kept in place.
+            if (
+                new_glyph.endPtsOfContours != glyph.endPtsOfContours
+                or new_glyph.flags != glyph.flags
+                or new_glyph.coordinates != glyph.coordinates
+            ):
+                # Drop any existing instructions to avoid stale programs.
+                new_glyph.program = ttProgram.Program()
+                new_glyph.recalcBounds(glyf)
+                glyf[name] = new_glyph
+                changed = True
+                continue
+
+        # A pen rebuild would reproduce this glyph point for point, so only
+        # drop its instructions; the glyph changed only if it had any or its
+        # stored bounds were off.
+        program = getattr(glyph, "program", None)
+        if program is not None and program.getBytecode():
+            glyph.program = ttProgram.Program()
+            changed = True
+        bounds = (glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax)
+        glyph.recalcBounds(glyf)
+        if (glyph.xMin, glyph.yMin, glyph.xMax, glyph.yMax) != bounds:
+            changed = True
 
     return changed
 
@@ -921,17 +1144,19 @@ def fix_license_entries(font: TTFont) -> bool:
     ofl_desc = "This Font Software is licensed under the SIL Open Font License, Version 1.1. This license is available with a FAQ at: https://openfontlicense.org"
     ofl_url = "https://openfontlicense.org"
 
-    def set_name(name_id, value):
-        name_table.setName(value, name_id, 3, 1, 0x409)
-        name_table.setName(value, name_id, 1, 0, 0)
-
-    changed = False
-    for nid, target in ((13, ofl_desc), (14, ofl_url)):
-        existing = name_table.getName(nid, 3, 1, 0x409)
-        if existing is None or existing.toUnicode() != target:
-            set_name(nid, target)
-            changed = True
-    return changed
+    # Windows and Mac records are checked separately; only rewrite the
+    # platform that differs.
+    stale = _stale_names(
+        name_table,
+        {
+            (13, 3, 1, 0x409): ofl_desc,
+            (13, 1, 0, 0): ofl_desc,
+            (14, 3, 1, 0x409): ofl_url,
+            (14, 1, 0, 0): ofl_url,
+        },
+    )
+    _set_names(name_table, stale)
+    return bool(stale)
 
 
 def fix_style_bits(font: TTFont) -> bool:
@@ -959,8 +1184,12 @@ def fix_style_bits(font: TTFont) -> bool:
     if is_regular:
         fs_sel |= 1 << 6
 
+    mac_style = (1 if is_bold else 0) | (2 if is_italic else 0)
+    if os2.fsSelection == fs_sel and head.macStyle == mac_style:
+        return False
+
     os2.fsSelection = fs_sel
-    head.macStyle = (1 if is_bold else 0) | (2 if is_italic else 0)
+    head.macStyle = mac_style
     return True
 
 
@@ -1003,6 +1232,39 @@ def fix_gdef_mark_classes(font: TTFont) -> bool:
 
 
 
+def apply_gftools_fixes(font: TTFont) -> bool:
+    """Run the fixers gftools.fix.fix_font applies, in place.
+
+    fix_font deep-copies the whole font before fixing it; calling its
+    fixers directly skips that copy. Source fixes stay disabled, matching
+    include_source_fixes=False. fix_license_strings is left out:
+    fix_license_entries writes the same OFL strings, and the gftools
+    fixer reports a change on every run.
+    """
+    changed = False
+    if font["OS/2"].version > 1 and font["OS/2"].version != 4:
+        font["OS/2"].version = 4
+        changed = True
+
+    fixers = [
+        fix_hinted_font,
+        fix_unhinted_font,
+        fix_no_varpsname,
+        fix_colr_font,
+        fix_hhea_caret_slope_run,
+        fix_fvar_instances,
+    ]
+    for fixer in fixers:
+        # Some fixers return the font rather than a flag; the messages are
+        # the reliable signal that something changed.
+        _, messages = fixer(font)
+        if messages:
+            logger.info("\n".join(messages))
+            changed = True
+
+    return changed
+
+
 def post_process_font(font_path: Path, output_path: Optional[Path] = None) -> bool:
     """Apply all post-processing fixes to a font."""
     if output_path is None:
@@ -1011,9 +1273,21 @@ def post_process_font(font_path: Path, output_path: Optional[Path] = None) -> bo
     logger.info(f"\nProcessing: {font_path.name}")
 
     try:
-        font = TTFont(font_path)
+        font = TTFont(font_path, lazy=True)
         fixes_applied = []
 
+        # Remove unwanted tables up front so no fix pass decompiles them
+        unwanted_tables = ["DSIG", "FFTM", "prop"]
+        removed_tables = []
+        for table in unwanted_tables:
+            if table in font:
+                del font[table]
+                removed_tables.append(table)
+
+        if removed_tables:
+            fixes_applied.append(f"removed_tables({','.join(removed_tables)})")
+            logger.info(f"  ✓ Removed unwanted tables: {', '.join(removed_tables)}")
+
         fix_map = [
             (fix_font_revision, "font_revision"),
             (fix_copyright_notice, "copyright_notice"),
@@ -1021,7 +1295,7 @@ def post_process_font(font_path: Path, output_path: Optional[Path] = None) -> bo
             (fix_vertical_metrics, "vertical_metrics"),
             (fix_fontbakery_version, "fontbakery_metadata"),
             (fix_zero_width_glyphs, "zero_width_glyphs"),
-            (fix_font_names, "font_names"),
+            (functools.partial(fix_font_names, font_path=font_path), "font_names"),
             (fix_dotted_circle, "dotted_circle"),
             (flatten_nested_components, "flattened_components"),
             (normalize_simple_glyphs, "normalized_glyf_flags"),
@@ -1032,8 +1306,8 @@ def post_process_font(font_path: Path, output_path: Optional[Path] = None) -> bo
                 fixes_applied.append(fix_name)
 
         # Run a light gftools fix pass for additional GF hygiene.
-        font = gftools_fix_font(font, include_source_fixes=False)
-        fixes_applied.append("gftools_fix_font")
+        if apply_gftools_fixes(font):
+            fixes_applied.append("gftools_fixes")
 
         if fix_spacing_metadata(font, font_path):
             fixes_applied.append("spacing_metadata")
@@ -1056,22 +1330,28 @@ def post_process_font(font_path: Path, output_path: Optional[Path] = None) -> bo
             if fix_func(font):
                 fixes_applied.append(fix_name)
 
-        # Remove unwanted tables
-        unwanted_tables = ["DSIG", "FFTM", "prop"]
-        removed_tables = []
-        for table in unwanted_tables:
-            if table in font:
-                del font[table]
-                removed_tables.append(table)
-
-        if removed_tables:
-            fixes_applied.append(f"removed_tables({','.join(removed_tables)})")
-            logger.info(f"  ✓ Removed unwanted tables: {', '.join(removed_tables)}")
-
-        # Save the modified font
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        font.save(output_path)
-        font.close()
+        # Save the modified font (callers create the output directories up front)
+        if fixes_applied:
+            # reorderTables=None skips fontTools' second rewrite pass that
+            # only changes the physical order of the table data. Write next
+            # to the target and rename so an interrupted run never leaves a
+            # truncated font behind.
+            tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+            try:
+                font.save(tmp_path, reorderTables=None)
+                font.close()
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                # Don't leave a partial temp file next to the output
+                tmp_path.unlink(missing_ok=True)
+                raise
+        else:
+            # Nothing changed: skip re-serializing the font
+            font.close()
+            if output_path != font_path:
+                # copyfile, not copy2: the output keeps its own write time,
+                # which is_up_to_date compares against the pipeline scripts
+                shutil.copyfile(font_path, output_path)
 
         logger.info(f"  ✅ Saved: {output_path.name}")
         logger.info(f"  Fixes applied: {', '.join(fixes_applied) if fixes_applied else 'none'}\n")
@@ -1085,21 +1365,38 @@ def post_process_font(font_path: Path, output_path: Optional[Path] = None) -> bo
         return False
 
 
+def bulk_output_dir(font_path: Path) -> Path:
+    """Map unprocessed_fonts/<plan_name>/ttf/<font>.ttf to fonts/<plan_name>/."""
+    plan_dir = font_path.parent.parent.name
+    return Path("fonts") / plan_dir.lower().replace(" ", "")
+
+
+def bulk_output_path(font_path: Path) -> Path:
+    """Full output path in fonts/ for a bulk-mode source font."""
+    # Normalize filename in a single scan
+    filename = _FILENAME_NORMALIZATION_RE.sub(lambda m: FILENAME_NORMALIZATION[m.group(0)], font_path.name)
+    return bulk_output_dir(font_path) / filename
+
+
+def pipeline_mtime_ns() -> int:
+    """Newest mtime among the post-processing scripts and version.json."""
+    scripts_dir = Path(__file__).resolve().parent
+    sources = [*scripts_dir.glob("*.py"), *(scripts_dir / "halfkern").glob("*.py"), _VERSION_JSON]
+    return max(p.stat().st_mtime_ns for p in sources if p.exists())
+
+
+def is_up_to_date(font_path: Path, output_path: Path, newest_input_ns: int) -> bool:
+    """True if output_path was written after both its source font and the pipeline."""
+    if not output_path.exists():
+        return False
+    output_mtime = output_path.stat().st_mtime_ns
+    return output_mtime >= font_path.stat().st_mtime_ns and output_mtime >= newest_input_ns
+
+
 def process_and_copy_font(font_path: Path) -> Tuple[bool, Path, Optional[Path]]:
     """Helper for parallel processing: fix and copy to 'fonts/' directory."""
     try:
-        # font_path structure: unprocessed_fonts/<plan_name>/ttf/<font>.ttf
-        plan_dir = font_path.parent.parent.name
-        dest_dir_name = plan_dir.lower().replace(" ", "")
-        dest_dir = Path("fonts") / dest_dir_name
-
-        # Normalize filename
-        filename = font_path.name
-        replacements = {"ExtraBold": "Extrabold", "ExtraLight": "Extralight", "SemiBold": "Semibold"}
-        for old, new in replacements.items():
-            filename = filename.replace(old, new)
-
-        output_path = dest_dir / filename
+        output_path = bulk_output_path(font_path)
         success = post_process_font(font_path, output_path)
         return success, font_path, output_path
 
@@ -1114,10 +1411,20 @@ async def async_main() -> None:
         "fonts", nargs="*", type=Path, help="Font files to process. If omitted, uses unprocessed_fonts/"
     )
     parser.add_argument("--output-dir", type=Path, help="Output directory (default: overwrite or use fonts/)")
-    parser.add_argument("--parallel", action="store_true", help="Process fonts in parallel")
+    parser.add_argument(
+        "--parallel", action="store_true", help="Process fonts in parallel (now the default; kept for compatibility)"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, help="Number of worker processes (default: CPU count; 1 processes fonts serially)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Reprocess every font in bulk mode, even if its output is up to date"
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
 
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("-j/--jobs must be at least 1")
 
     if args.debug:
         logger.setLevel(logging.DEBUG)
@@ -1164,21 +1471,47 @@ async def async_main() -> None:
             sys.exit(1)
 
         output_root = Path("fonts")
+        outputs = {f: bulk_output_path(f) for f in fonts}
+        targets = set(outputs.values())
+
+        # Only remove outputs that no longer have a source font, rather than
+        # wiping the whole tree; unchanged fonts are skipped below.
         if output_root.exists():
-            logger.info(f"Cleaning existing output directory: {output_root}")
-            shutil.rmtree(output_root)
+            for existing in sorted(output_root.rglob("*"), reverse=True):
+                if existing.is_file() and existing not in targets:
+                    logger.info(f"Removing stale output: {existing}")
+                    existing.unlink()
+                elif existing.is_dir() and not any(existing.iterdir()):
+                    existing.rmdir()
         output_root.mkdir(parents=True, exist_ok=True)
 
-        num_workers = os.cpu_count() or 4
-        logger.info(f"Bulk processing {len(fonts)} fonts using {num_workers} workers...")
+        # Create every destination directory once, before dispatching workers
+        for dest_dir in {bulk_output_dir(f) for f in fonts}:
+            dest_dir.mkdir(parents=True, exist_ok=True)
 
+        if args.force:
+            pending = fonts
+        else:
+            newest_input_ns = pipeline_mtime_ns()
+            pending = [f for f in fonts if not is_up_to_date(f, outputs[f], newest_input_ns)]
+        skipped_count = len(fonts) - len(pending)
+        if skipped_count:
+            logger.info(f"Skipping {skipped_count} up-to-date fonts (use --force to reprocess)")
+
+        num_workers = args.jobs if args.jobs is not None else os.cpu_count() or 4
+        logger.info(f"Bulk processing {len(pending)} fonts using {num_workers} workers...")
+
+        # Hand out the largest fonts first so small ones fill in the tail.
+        # Yielding after each start lets that task queue on the limiter
+        # before the next, keeping workers on this order.
         limiter = trio.CapacityLimiter(num_workers)
         async with trio.open_nursery() as nursery:
-            for font_path in fonts:
+            for font_path in sorted(pending, key=lambda f: f.stat().st_size, reverse=True):
                 nursery.start_soon(process_bulk_font_async, font_path, limiter)
+                await trio.sleep(0)
 
-        success_count = sum(1 for success, _, _ in results if success)
-        total_count = len(results)
+        success_count = skipped_count + sum(1 for success, _, _ in results if success)
+        total_count = len(fonts)
 
         if success_count < total_count:
             logger.error("\nFailed fonts:")
@@ -1191,23 +1524,30 @@ async def async_main() -> None:
             args.output_dir.mkdir(parents=True, exist_ok=True)
 
         total_count = len(args.fonts)
-        if args.parallel and total_count > 1:
-            num_workers = min(os.cpu_count() or 4, total_count)
-            logger.info(f"Processing {total_count} fonts in parallel using {num_workers} workers...")
+        fonts = []
+        for f in args.fonts:
+            if f.exists():
+                fonts.append(f)
+            else:
+                logger.warning(f"File not found: {f}")
+
+        # Fonts are independent, so fan them out across worker processes
+        # unless there is only one font (or one job) to run.
+        num_workers = min(args.jobs if args.jobs is not None else os.cpu_count() or 4, len(fonts))
+        if num_workers > 1:
+            logger.info(f"Processing {len(fonts)} fonts in parallel using {num_workers} workers...")
 
             limiter = trio.CapacityLimiter(num_workers)
             async with trio.open_nursery() as nursery:
-                for f in args.fonts:
+                for f in sorted(fonts, key=lambda f: f.stat().st_size, reverse=True):
                     out = args.output_dir / f.name if args.output_dir else f
                     nursery.start_soon(process_font_async, f, out, limiter)
+                    await trio.sleep(0)
 
             success_count = sum(1 for success, _, _ in results if success)
         else:
             success_count = 0
-            for f in args.fonts:
-                if not f.exists():
-                    logger.warning(f"File not found: {f}")
-                    continue
+            for f in fonts:
                 out = args.output_dir / f.name if args.output_dir else f
                 if post_process_font(f, out):
                     success_count += 1
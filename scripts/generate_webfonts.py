@@ -11,6 +11,9 @@ in three variants:
 Output is written to webfonts/<subset>/<family>/ with subset-first directory structure.
 """
 
+import argparse
+import functools
+import io
 import logging
 import os
 import shutil
@@ -20,6 +23,7 @@ from typing import Dict, List, Optional, Tuple
 
 import trio
 import trio_parallel
+import uharfbuzz as hb
 
 from fontTools import subset
 from fontTools.ttLib import TTFont
@@ -30,6 +34,10 @@ from fontTools.ttLib import TTFont
 INPUT_ROOT = Path("fonts")
 OUTPUT_ROOT = Path("webfonts")
 
+# Output is built here and swapped into OUTPUT_ROOT once every file succeeded
+STAGING_ROOT = OUTPUT_ROOT.with_name(f"{OUTPUT_ROOT.name}.new")
+STALE_ROOT = OUTPUT_ROOT.with_name(f"{OUTPUT_ROOT.name}.old")
+
 # Unicode ranges for subsetting
 SUBSETS: Dict[str, Optional[str]] = {
     "full": None,  # No subsetting - keep all glyphs
@@ -37,6 +45,9 @@ SUBSETS: Dict[str, Optional[str]] = {
     "latin": "U+0000-00FF",  # Basic Latin + Latin-1 Supplement
 }
 
+# fontTools compresses WOFF2 at Brotli's maximum quality unless told otherwise
+DEFAULT_BROTLI_QUALITY = 11
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,52 +61,125 @@ logger = logging.getLogger(__name__)
 # ----------------------------------------------------------------------------
 
 
-def generate_webfont(args: Tuple[Path, str, Optional[str]]) -> Tuple[bool, Path, Optional[Path], str]:
+class _TunedBrotli:
+    """Proxy for the brotli module fontTools uses, with a fixed compress quality."""
+
+    def __init__(self, module, quality: int):
+        self._module = module
+        self.quality = quality
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def compress(self, data, **kwargs):
+        kwargs.setdefault("quality", self.quality)
+        return self._module.compress(data, **kwargs)
+
+
+def set_brotli_quality(quality: int) -> None:
+    """Make fontTools' WOFF2 writer compress at the given Brotli quality."""
+    from fontTools.ttLib import woff2
+
+    current = woff2.brotli
+    if isinstance(current, _TunedBrotli):
+        current.quality = quality
+    elif quality != DEFAULT_BROTLI_QUALITY:
+        woff2.brotli = _TunedBrotli(current, quality)
+
+
+@functools.lru_cache(maxsize=None)
+def subset_unicodes(unicode_range: str) -> frozenset:
+    """Parse a SUBSETS range into its codepoints once per worker process."""
+    return frozenset(subset.parse_unicodes(unicode_range))
+
+
+@functools.lru_cache(maxsize=None)
+def subset_input(unicode_range: str) -> hb.SubsetInput:
+    """Build the HarfBuzz subset plan for a SUBSETS range once per worker process."""
+    plan = hb.SubsetInput()
+    plan.unicode_set.update(subset_unicodes(unicode_range))
+    # Empty-then-invert selects everything: keep all OpenType features and
+    # all name table entries in every language.
+    for kind in (
+        hb.SubsetInputSets.LAYOUT_FEATURE_TAG,
+        hb.SubsetInputSets.NAME_ID,
+        hb.SubsetInputSets.NAME_LANG_ID,
+    ):
+        keep = plan.sets(kind)
+        keep.clear()
+        keep.invert()
+    # Keep .notdef, .null, CR and space (gids 0-3) like pyftsubset's
+    # --recommended-glyphs; glyph names are dropped unless GLYPH_NAMES is set.
+    plan.glyph_set.update(range(4))
+    plan.flags = hb.SubsetFlags.NAME_LEGACY | hb.SubsetFlags.NOTDEF_OUTLINE
+    return plan
+
+
+def prune_subset_font(font: TTFont, unicodes: frozenset) -> None:
+    """Trim an hb-subset result's cmap and OS/2 ranges to what pyftsubset keeps.
+
+    HarfBuzz also keeps every codepoint mapped to a retained glyph, so the
+    seeded gids 0-3 can pull in characters outside the range.
+    """
+    for table in font["cmap"].tables:
+        if table.isUnicode() and table.format != 14:
+            for cp in table.cmap.keys() - unicodes:
+                del table.cmap[cp]
+    # Like pyftsubset, only clear bits for ranges the subset no longer
+    # covers; compiling OS/2 also recomputes usFirstCharIndex/usLastCharIndex.
+    os2 = font["OS/2"]
+    os2.recalcUnicodeRanges(font, pruneOnly=True)
+    if os2.version >= 1:
+        os2.recalcCodePageRanges(font, pruneOnly=True)
+
+
+def generate_webfont(args: Tuple[Path, str, Optional[str], int]) -> Tuple[bool, Path, Optional[Path], str]:
     """
     Generate a single WOFF2 webfont, optionally with subsetting.
 
     Args:
-        args: Tuple of (font_path, subset_name, unicode_range)
+        args: Tuple of (font_path, subset_name, unicode_range, brotli_quality)
 
     Returns:
         tuple: (success, input_path, output_path, subset_name)
     """
-    font_path, subset_name, unicode_range = args
+    font_path, subset_name, unicode_range, brotli_quality = args
 
     try:
+        set_brotli_quality(brotli_quality)
+
         # Determine output path
         # Input: fonts/<family>/Font-Weight.ttf
-        # Output: webfonts/<subset>/<family>/Font-Weight.woff2
+        # Output: webfonts/<subset>/<family>/Font-Weight.woff2 (written to the staging root)
         family_dir = font_path.parent.name
         stem = font_path.stem  # e.g., "IosevkaCharon-Regular"
         output_filename = f"{stem}.woff2"
 
-        output_dir = OUTPUT_ROOT / subset_name / family_dir
+        output_dir = STAGING_ROOT / subset_name / family_dir
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / output_filename
 
         if unicode_range is None:
-            # Full variant - just convert to WOFF2 without subsetting
-            font = TTFont(font_path)
+            # Full variant - just convert to WOFF2 without subsetting. The
+            # bounds are already final, so skip recomputing them on save.
+            font = TTFont(font_path, recalcBBoxes=False, recalcTimestamp=False)
             font.flavor = "woff2"
             font.save(output_path)
         else:
-            # Subset variant - use fontTools.subset
-            options = subset.Options()
-            options.flavor = "woff2"
-            options.layout_features = ["*"]  # Keep all OpenType features
-            options.glyph_names = False  # Strip glyph names for smaller file
-            options.name_IDs = ["*"]  # Keep all name table entries
-            options.name_legacy = True
-            options.name_languages = ["*"]
-            options.notdef_outline = True  # Keep .notdef glyph outline
-            options.recommended_glyphs = True  # Keep .notdef, space, etc.
-
-            font = subset.load_font(font_path, options)
-            subsetter = subset.Subsetter(options)
-            subsetter.populate(unicodes=subset.parse_unicodes(unicode_range))
-            subsetter.subset(font)
-            subset.save_font(font, output_path, options)
+            # Subset variant - subset with HarfBuzz, then let fontTools
+            # write the WOFF2
+            face = hb.Face(hb.Blob.from_file_path(str(font_path)))
+            subset_face = hb.subset(face, subset_input(unicode_range))
+            if subset_face is None:
+                raise RuntimeError("hb-subset failed")
+            font = TTFont(
+                io.BytesIO(subset_face.blob.data),
+                recalcBBoxes=False,
+                recalcTimestamp=False,
+            )
+            prune_subset_font(font, subset_unicodes(unicode_range))
+            font.flavor = "woff2"
+            font.save(output_path)
 
         return True, font_path, output_path, subset_name
 
@@ -113,29 +197,42 @@ def generate_webfont(args: Tuple[Path, str, Optional[str]]) -> Tuple[bool, Path,
 
 async def async_main() -> None:
     """Async main execution block."""
+    parser = argparse.ArgumentParser(description="Generate WOFF2 webfonts with character set subsets")
+    parser.add_argument(
+        "--brotli-quality",
+        type=int,
+        choices=range(12),
+        default=DEFAULT_BROTLI_QUALITY,
+        metavar="0-11",
+        help=f"Brotli quality for WOFF2 compression (default: {DEFAULT_BROTLI_QUALITY}; lower is faster, larger)",
+    )
+    args = parser.parse_args()
+
     fonts = sorted(INPUT_ROOT.glob("**/*.ttf"))
 
     if not fonts:
         logger.error(f"ERROR: No TTF files found in {INPUT_ROOT} to process.")
         sys.exit(1)
 
-    # Clean and prepare output directory
-    if OUTPUT_ROOT.exists():
-        logger.info(f"Cleaning existing output directory: {OUTPUT_ROOT}")
-        shutil.rmtree(OUTPUT_ROOT)
-    OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
-
-    # Build work queue: each font × each subset variant
-    work_items: List[Tuple[Path, str, Optional[str]]] = []
-    for font_path in fonts:
+    # Prepare a fresh staging directory; the existing output stays in place
+    # until the new set is complete.
+    for leftover in (STAGING_ROOT, STALE_ROOT):
+        if leftover.exists():
+            shutil.rmtree(leftover)
+    STAGING_ROOT.mkdir(parents=True)
+
+    # Build work queue: each font × each subset variant, largest fonts first
+    # so small ones fill in the tail
+    work_items: List[Tuple[Path, str, Optional[str], int]] = []
+    for font_path in sorted(fonts, key=lambda f: f.stat().st_size, reverse=True):
         for subset_name, unicode_range in SUBSETS.items():
-            work_items.append((font_path, subset_name, unicode_range))
+            work_items.append((font_path, subset_name, unicode_range, args.brotli_quality))
 
     # Results collector
     results: List[Tuple[bool, Path, Optional[Path], str]] = []
 
     async def process_webfont_async(
-        args: Tuple[Path, str, Optional[str]],
+        args: Tuple[Path, str, Optional[str], int],
         limiter: trio.CapacityLimiter,
     ) -> None:
         """Async wrapper for CPU-bound webfont generation."""
@@ -158,6 +255,8 @@ async def async_main() -> None:
     async with trio.open_nursery() as nursery:
         for work_item in work_items:
             nursery.start_soon(process_webfont_async, work_item, limiter)
+            # Let it queue on the limiter before the next, keeping this order
+            await trio.sleep(0)
 
     # Summary
     successful = sum(1 for success, _, _, _ in results if success)
@@ -174,8 +273,16 @@ async def async_main() -> None:
         for success, input_path, _, subset_name in results:
             if not success:
                 logger.error(f"  - {input_path} ({subset_name})")
+        logger.error(f"\nKept previous {OUTPUT_ROOT}/; partial output left in {STAGING_ROOT}/")
         sys.exit(1)
 
+    # Swap the staged output into place, then drop the previous generation
+    if OUTPUT_ROOT.exists():
+        OUTPUT_ROOT.rename(STALE_ROOT)
+    STAGING_ROOT.rename(OUTPUT_ROOT)
+    if STALE_ROOT.exists():
+        shutil.rmtree(STALE_ROOT)
+
     # Print file size summary for one font as a sanity check
     logger.info("")
     logger.info("Sample file sizes (IosevkaCharon-Regular):")
@@ -72,6 +72,27 @@ async def run_cmd(command: str, cwd: Optional[Path] = None) -> None:
         raise
 
 
+def copy_font_file(src: Path, dest_dir: Path) -> Path:
+    """Copies a built font into dest_dir, preserving its timestamps.
+
+    shutil.copyfile takes the kernel's zero-copy path (sendfile) on Linux;
+    only atime/mtime are carried over, skipping copy2's permission, flag, and
+    xattr round-trips that the build outputs don't need.
+
+    Args:
+        src: Font file to copy.
+        dest_dir: Directory to copy the file into.
+
+    Returns:
+        Path of the copied file.
+    """
+    dest = dest_dir / src.name
+    shutil.copyfile(src, dest)
+    st = src.stat()
+    os.utime(dest, ns=(st.st_atime_ns, st.st_mtime_ns))
+    return dest
+
+
 # Environment Setup
 # ----------------------------------------------------------------------------
 
@@ -170,8 +191,17 @@ async def build_one_plan(plan_name: str) -> None:
         logger.error(f"Dist folder not found: {plan_dist_dir}")
         raise FileNotFoundError(f"Dist folder not found: {plan_dist_dir}")
 
-    for file in plan_dist_dir.glob("*.ttf"):
-        shutil.copy2(file, ttf_out_dir)
+    # Copies are I/O-bound, so overlap them on worker threads.
+    ttf_files = sorted(plan_dist_dir.glob("*.ttf"))
+    limiter = trio.CapacityLimiter(max(1, min(32, len(ttf_files))))
+
+    async def copy_async(file: Path) -> None:
+        """Async wrapper that offloads a single copy to a worker thread."""
+        await trio.to_thread.run_sync(copy_font_file, file, ttf_out_dir, limiter=limiter)
+
+    async with trio.open_nursery() as nursery:
+        for file in ttf_files:
+            nursery.start_soon(copy_async, file)
 
 
 def get_worker_count(plan_total: int) -> int:
@@ -23,6 +23,7 @@ from pathlib import Path
 REPO_ROOT = Path(__file__).resolve().parent.parent
 UPSTREAM_PACKAGE_JSON = REPO_ROOT / "sources" / "iosevka" / "package.json"
 VERSION_JSON = REPO_ROOT / "sources" / "version.json"
+CHECK_STAMP = REPO_ROOT / ".cache" / "version_check.stamp"
 
 
 def semver_to_gf(semver: str) -> str:
@@ -77,8 +78,23 @@ def write_version_json(upstream: str, gf_version: str) -> None:
     print(f"  gf_version_string: Version {gf_version}")
 
 
+def _check_stamp_key() -> str | None:
+    """Key a successful check on the mtimes of its inputs (and this script)."""
+    try:
+        paths = (UPSTREAM_PACKAGE_JSON, VERSION_JSON, Path(__file__).resolve())
+        return ":".join(str(p.stat().st_mtime_ns) for p in paths)
+    except FileNotFoundError:
+        return None
+
+
 def check_mode() -> None:
     """Verify version.json is up-to-date with upstream. Exit 1 if stale."""
+    stamp_key = _check_stamp_key()
+    if stamp_key is not None and CHECK_STAMP.exists():
+        if CHECK_STAMP.read_text(encoding="utf-8").strip() == stamp_key:
+            print("OK: version.json is up-to-date (cached)")
+            return
+
     upstream = read_upstream_version()
     gf_version = semver_to_gf(upstream)
 
@@ -96,6 +112,10 @@ def check_mode() -> None:
         )
         sys.exit(1)
 
+    if stamp_key is not None:
+        CHECK_STAMP.parent.mkdir(parents=True, exist_ok=True)
+        CHECK_STAMP.write_text(stamp_key + "\n", encoding="utf-8")
+
     print(f"OK: version.json is up-to-date (upstream={upstream}, gf={gf_version})")
 
 
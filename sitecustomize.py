@@ -5,13 +5,49 @@ We patch FontTools script metadata so FontBakery's glyphset language checks
 do not crash on newer gflanguages entries that reference the non-standard
 \"Berf\" script (Beria Erfe). The value is intentionally mapped to itself so
 glyphsets that rely on standard scripts will simply skip it.
+
+The patch is applied from an import hook the first time
+fontTools.unicodedata.Scripts is imported, so interpreters that never touch
+it (e.g. post-processing worker processes) don't pay for loading the Unicode
+script tables at startup.
 """
 
-try:
-    from fontTools.unicodedata import Scripts
+import importlib.abc
+import importlib.util
+import sys
+
+_SCRIPTS_MODULE = "fontTools.unicodedata.Scripts"
+
 
+def _patch_scripts(scripts) -> None:
     # Ensure unknown script code from gflanguages does not raise KeyError in glyphsets
-    Scripts.NAMES.setdefault("Berf", "Berf")
-except ImportError:
-    # fontTools not available yet (e.g., during nix shell initialization)
-    pass
+    scripts.NAMES.setdefault("Berf", "Berf")
+
+
+class _ScriptsPatchFinder(importlib.abc.MetaPathFinder):
+    """Wrap the loader of fontTools.unicodedata.Scripts to patch it once loaded."""
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname != _SCRIPTS_MODULE:
+            return None
+
+        # One-shot hook: step aside so the regular finders resolve the module.
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+
+        exec_module = spec.loader.exec_module
+
+        def exec_and_patch(module):
+            exec_module(module)
+            _patch_scripts(module)
+
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+
+if _SCRIPTS_MODULE in sys.modules:
+    _patch_scripts(sys.modules[_SCRIPTS_MODULE])
+else:
+    sys.meta_path.insert(0, _ScriptsPatchFinder())
@@ -7,13 +7,17 @@ any positioning differences between post-processed and base fonts.
 Uses multiprocessing for speed.
 """
 
+import json
 import sys
 import os
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import chain
 
+import numpy as np
 import uharfbuzz as hb
+from fontTools import unicodedata
 from fontTools.ttLib import TTFont
 from fontTools.pens.recordingPen import DecomposingRecordingPen
 from io import BytesIO
@@ -25,9 +29,28 @@ import shutil
 GF_FONT = "fonts/iosevkacharon/IosevkaCharon-Regular.ttf"
 BASE_FONT = "unprocessed_fonts/IosevkaCharon/ttf/IosevkaCharon-Regular.ttf"
 
+# Every failure is appended here as one JSON object per line
+FAILURES_LOG = "out/failures.jsonl"
+
 # Tolerance for "approximately identical" (in font units)
 TOLERANCE = 2
 
+# Unicode blocks of combining marks to test against every base
+COMBINING_MARK_CODEPOINTS = frozenset().union(
+    range(0x0300, 0x0370),  # Combining Diacritical Marks
+    range(0x1AB0, 0x1B00),  # Combining Diacritical Marks Extended
+    range(0x1DC0, 0x1E00),  # Combining Diacritical Marks Supplement
+    range(0x20D0, 0x2100),  # Combining Diacritical Marks for Symbols
+    range(0xFE20, 0xFE30),  # Combining Half Marks
+)
+
+
+def get_worker_count() -> int:
+    """Count the CPUs this process may run on, honouring container CPU sets."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
 
 def load_font_data(font_path: str) -> bytes:
     """Load font file into memory."""
@@ -35,11 +58,26 @@ def load_font_data(font_path: str) -> bytes:
         return f.read()
 
 
-def shape_text(font_data: bytes, text: str, include_advance: bool = False) -> list:
+# HarfBuzz fonts keyed by their blob, built once per process
+_hb_fonts: dict[bytes, hb.Font] = {}
+
+
+def get_hb_font(font_data: bytes) -> hb.Font:
+    """Return the cached hb.Font for a font blob, building it on first use."""
+    font = _hb_fonts.get(font_data)
+    if font is None:
+        font = _hb_fonts[font_data] = hb.Font(hb.Face(font_data))
+    return font
+
+
+# Shaping buffer reused by every shape_text call in this process
+_hb_buffer = hb.Buffer()
+
+
+def shape_text(font: hb.Font, text: str, include_advance: bool = False) -> list:
     """Shape text and return glyph positions."""
-    face = hb.Face(font_data)
-    font = hb.Font(face)
-    buf = hb.Buffer()
+    buf = _hb_buffer
+    buf.clear_contents()
     buf.add_str(text)
     buf.guess_segment_properties()
     hb.shape(font, buf)
@@ -49,28 +87,25 @@ def shape_text(font_data: bytes, text: str, include_advance: bool = False) -> li
     return [(pos.x_offset, pos.y_offset) for pos in buf.glyph_positions]
 
 
-def get_combining_marks(font_path: str) -> list[tuple[int, str]]:
-    """Get all combining marks from the font's cmap."""
-    font = TTFont(font_path)
-    cmap = font.getBestCmap()
+def get_combining_marks(font_data: bytes) -> list[int]:
+    """Get all combining mark codepoints from the font's cmap."""
+    # HarfBuzz reads the cmap directly, without building a glyph order
+    unicodes = hb.Face(font_data).unicodes
+    return sorted(COMBINING_MARK_CODEPOINTS.intersection(unicodes))
 
-    marks = []
-    for cp, glyph_name in cmap.items():
-        # Unicode combining marks are in these ranges:
-        # 0x0300-0x036F: Combining Diacritical Marks
-        # 0x1AB0-0x1AFF: Combining Diacritical Marks Extended
-        # 0x1DC0-0x1DFF: Combining Diacritical Marks Supplement
-        # 0x20D0-0x20FF: Combining Diacritical Marks for Symbols
-        # 0xFE20-0xFE2F: Combining Half Marks
-        if (0x0300 <= cp <= 0x036F or
-            0x1AB0 <= cp <= 0x1AFF or
-            0x1DC0 <= cp <= 0x1DFF or
-            0x20D0 <= cp <= 0x20FF or
-            0xFE20 <= cp <= 0xFE2F):
-            marks.append((cp, glyph_name))
 
-    font.close()
-    return marks
+def iter_failure_labels(log_path: str, phase: str):
+    """Yield the text of each logged failure from one phase, reading lazily."""
+    with open(log_path, encoding="utf-8") as log:
+        for line in log:
+            record = json.loads(line)
+            if record["phase"] == phase:
+                yield record["text"]
+
+
+def log_failure(log, phase: str, text: str, detail: str) -> None:
+    """Append one failure to the JSON-lines failure log."""
+    log.write(json.dumps({"phase": phase, "text": text, "detail": detail}, ensure_ascii=False) + "\n")
 
 
 def get_base_chars() -> list[str]:
@@ -88,14 +123,29 @@ def get_base_chars() -> list[str]:
     ]
 
 
+def marks_for_base(base_char: str, marks: list[int]) -> list[int]:
+    """Keep the marks that can apply to base_char's script.
+
+    Generic diacritics (U+0300-036F and script-neutral marks) go with every
+    base; marks tied to specific scripts are only paired with those scripts.
+    """
+    script = unicodedata.script(base_char)
+    return [
+        cp for cp in marks
+        if 0x0300 <= cp <= 0x036F
+        or (scripts := unicodedata.script_extension(chr(cp))) == {"Zinh"}
+        or script in scripts
+    ]
+
+
 def test_single_combination(args: tuple) -> tuple[str, bool, str]:
     """Test a single base+mark combination. Returns (text, passed, detail)."""
-    base_char, mark_cp, gf_data, base_data = args
+    base_char, mark_cp = args
     text = base_char + chr(mark_cp)
 
     try:
-        gf_pos = shape_text(gf_data, text)
-        base_pos = shape_text(base_data, text)
+        gf_pos = shape_text(worker_context['gf_hb'], text)
+        base_pos = shape_text(worker_context['base_hb'], text)
 
         if gf_pos == base_pos:
             return (text, True, "")
@@ -105,6 +155,12 @@ def test_single_combination(args: tuple) -> tuple[str, bool, str]:
         return (text, False, f"Error: {e}")
 
 
+def test_base_row(args: tuple) -> list[tuple[str, bool, str]]:
+    """Test one base character against every mark, as a single worker task."""
+    base_char, mark_cps = args
+    return [test_single_combination((base_char, mark_cp)) for mark_cp in mark_cps]
+
+
 def test_stacked_marks(gf_data: bytes, base_data: bytes) -> list[tuple[str, bool, str]]:
     """Test stacked combining marks (multiple marks on one base)."""
     results = []
@@ -119,10 +175,13 @@ def test_stacked_marks(gf_data: bytes, base_data: bytes) -> list[tuple[str, bool
         ("р̌̄", "Cyrillic r + caron + macron"),
     ]
 
+    gf_font = get_hb_font(gf_data)
+    base_font = get_hb_font(base_data)
+
     for text, desc in stacked_tests:
         try:
-            gf_pos = shape_text(gf_data, text)
-            base_pos = shape_text(base_data, text)
+            gf_pos = shape_text(gf_font, text)
+            base_pos = shape_text(base_font, text)
             passed = gf_pos == base_pos
             detail = "" if passed else f"GF={gf_pos} vs Base={base_pos}"
             results.append((f"{text} ({desc})", passed, detail))
@@ -133,111 +192,133 @@ def test_stacked_marks(gf_data: bytes, base_data: bytes) -> list[tuple[str, bool
 
 
 def fuzzy_equal(v1, v2, tol=TOLERANCE):
-    """Deep fuzzy equality check for nested numeric structures."""
-    if type(v1) != type(v2):
-        return False
-    if isinstance(v1, (int, float)):
-        return abs(v1 - v2) <= tol
-    if isinstance(v1, (list, tuple)):
-        if len(v1) != len(v2):
-            return False
-        return all(fuzzy_equal(a, b, tol) for a, b in zip(v1, v2))
-    return v1 == v2
+    """Fuzzy equality check for equally shaped numeric sequences."""
+    a = np.asarray(v1)
+    b = np.asarray(v2)
+    return a.shape == b.shape and bool(np.all(np.abs(a - b) <= tol))
+
+
+def split_pen_value(value: list) -> tuple[list, list]:
+    """Split RecordingPen commands into (op, arg count) pairs and one flat point list."""
+    layout = [(op, len(args)) for op, args in value]
+    points = list(chain.from_iterable(args for _, args in value))
+    return layout, points
 
 
 def fuzzy_compare_pen(val1: list, val2: list) -> bool:
     """Compare two RecordingPen command lists with translation invariance and tolerance."""
     if len(val1) != len(val2):
         return False
-        
-    def get_first_point(v):
-        for _, args in v:
-            for arg in args:
-                if isinstance(arg, tuple) and len(arg) == 2 and all(isinstance(i, (int, float)) for i in arg):
-                    return arg
-                elif isinstance(arg, (list, tuple)):
-                    for sub in arg:
-                        if isinstance(sub, tuple) and len(sub) == 2 and all(isinstance(i, (int, float)) for i in sub):
-                            return sub
-        return None
-        
-    p1 = get_first_point(val1)
-    p2 = get_first_point(val2)
-    
-    if p1 is None and p2 is None:
-        return True # Both empty
-    if p1 is None or p2 is None:
-        return False # One empty, one not
-        
-    # Offset based on first point for translation invariance
-    dx = p1[0] - p2[0]
-    dy = p1[1] - p2[1]
-    
-    for (op1, args1), (op2, args2) in zip(val1, val2):
-        if op1 != op2:
+
+    # Commands and their argument layout (None marks an implied on-curve
+    # point) must match exactly; only the points themselves are fuzzy.
+    layout1, points1 = split_pen_value(val1)
+    layout2, points2 = split_pen_value(val2)
+    if layout1 != layout2:
+        return False
+    if None in points1 or None in points2:
+        if [pt is None for pt in points1] != [pt is None for pt in points2]:
             return False
-            
-        # Recursive check with offset application
-        def check_args(a1, a2):
-            if type(a1) != type(a2):
-                return False
-            if isinstance(a1, (int, float)):
-                return abs(a1 - a2) <= TOLERANCE
-            if isinstance(a1, tuple) and len(a1) == 2 and all(isinstance(i, (int, float)) for i in a1):
-                # This is a point, check against offset
-                return abs((a1[0] - a2[0]) - dx) <= TOLERANCE and \
-                       abs((a1[1] - a2[1]) - dy) <= TOLERANCE
-            if isinstance(a1, (list, tuple)):
-                if len(a1) != len(a2):
-                    return False
-                return all(check_args(i1, i2) for i1, i2 in zip(a1, a2))
-            return a1 == a2
-            
-        if not check_args(args1, args2):
+        points1 = [pt for pt in points1 if pt is not None]
+        points2 = [pt for pt in points2 if pt is not None]
+    if not points1:
+        return True  # Both empty
+
+    # Offset based on first point for translation invariance
+    (x1, y1), (x2, y2) = points1[0], points2[0]
+    dx = x1 - x2
+    dy = y1 - y2
+
+    # Glyphs are a few dozen points, where a plain loop that stops at the
+    # first mismatch beats building arrays
+    for (x1, y1), (x2, y2) in zip(points1, points2):
+        if abs(x1 - x2 - dx) > TOLERANCE or abs(y1 - y2 - dy) > TOLERANCE:
             return False
-            
     return True
 
 
+# bytes.translate table keeping only the glyf flag bits that shape the
+# outline: on-curve (0x01) and cubic (0x80), dropping the overlap hint
+_OUTLINE_FLAG_BITS = bytes(flag & 0x81 for flag in range(256))
+
+
 # Worker globals to cache font objects
 worker_context = {}
 
 def init_worker(gf_data, base_data):
     """Initialize worker process with cached font objects."""
-    gf_tt = TTFont(BytesIO(gf_data))
-    base_tt = TTFont(BytesIO(base_data))
+    # Lazy: workers only touch glyf and what the glyph sets need
+    gf_tt = TTFont(BytesIO(gf_data), lazy=True)
+    base_tt = TTFont(BytesIO(base_data), lazy=True)
     
     worker_context['gf_tt'] = gf_tt
     worker_context['base_tt'] = base_tt
-    worker_context['gf_hb'] = hb.Font(hb.Face(gf_data))
-    worker_context['base_hb'] = hb.Font(hb.Face(base_data))
-    worker_context['gf_cmap'] = gf_tt.getBestCmap()
-    worker_context['base_cmap'] = base_tt.getBestCmap()
+    worker_context['gf_hb'] = get_hb_font(gf_data)
+    worker_context['base_hb'] = get_hb_font(base_data)
     worker_context['gf_glyph_set'] = gf_tt.getGlyphSet()
     worker_context['base_glyph_set'] = base_tt.getGlyphSet()
 
-def fuzzy_equal(v1, v2, tol=TOLERANCE):
+
+def packed_simple_glyph(tt: TTFont, glyph_name: str) -> bytes | None:
+    """Return a simple glyph's packed glyf data if it hasn't been expanded yet."""
+    glyph = tt['glyf'].glyphs.get(glyph_name)
+    data = getattr(glyph, 'data', None)
+    # Composites (negative numberOfContours) reference other glyphs by ID,
+    # so equal bytes don't imply equal outlines
+    if not data or int.from_bytes(data[:2], 'big', signed=True) < 0:
+        return None
+    return data
+
+
+def same_simple_outline(gf_tt: TTFont, gf_gn: str, base_tt: TTFont, base_gn: str) -> bool:
+    """Check whether two simple glyphs have exactly the same points.
+
+    A False result only means "not proven equal"; callers fall back to the
+    decomposed pen comparison, which also tolerates shifts and rounding.
+    """
+    if 'glyf' not in gf_tt or 'glyf' not in base_tt:
+        return False
+
+    # Byte-identical simple glyphs draw identically, without unpacking them
+    gf_raw = packed_simple_glyph(gf_tt, gf_gn)
+    if gf_raw is not None and gf_raw == packed_simple_glyph(base_tt, base_gn):
+        return True
+
+    gf_glyph = gf_tt['glyf'][gf_gn]
+    base_glyph = base_tt['glyf'][base_gn]
+    if gf_glyph.isComposite() or base_glyph.isComposite():
+        return False
+    if gf_glyph.numberOfContours != base_glyph.numberOfContours:
+        return False
+    if gf_glyph.numberOfContours == 0:
+        return True
+    # Hinting, bounds and overlap bits may differ; the points may not
+    return (
+        list(gf_glyph.endPtsOfContours) == list(base_glyph.endPtsOfContours)
+        and bytes(gf_glyph.flags).translate(_OUTLINE_FLAG_BITS)
+        == bytes(base_glyph.flags).translate(_OUTLINE_FLAG_BITS)
+        and gf_glyph.coordinates == base_glyph.coordinates
+    )
+
+
+def test_glyph_integrity_batch(glyphs: list[tuple[int, str, str]]) -> list[tuple[str, bool, str]]:
+    """Check shaping and outlines for a batch of (codepoint, GF glyph, base glyph) entries."""
+    gf_hb_font = worker_context['gf_hb']
+    base_hb_font = worker_context['base_hb']
+    gf_glyph_set = worker_context['gf_glyph_set']
+    base_glyph_set = worker_context['base_glyph_set']
+    gf_tt = worker_context['gf_tt']
+    base_tt = worker_context['base_tt']
 
     results = []
-    for cp in codepoints:
+    for cp, gf_gn, base_gn in glyphs:
         char = chr(cp)
         label = f"U+{cp:04X} ({char})"
         
         # 1. Shaping check (Positioning/Advance)
         try:
-            # GF
-            buf = hb.Buffer()
-            buf.add_str(char)
-            buf.guess_segment_properties()
-            hb.shape(gf_hb_font, buf)
-            gf_pos = [(p.x_offset, p.y_offset, p.x_advance) for p in buf.glyph_positions]
-            
-            # Base
-            buf = hb.Buffer()
-            buf.add_str(char)
-            buf.guess_segment_properties()
-            hb.shape(base_hb_font, buf)
-            base_pos = [(p.x_offset, p.y_offset, p.x_advance) for p in buf.glyph_positions]
+            gf_pos = shape_text(gf_hb_font, char, include_advance=True)
+            base_pos = shape_text(base_hb_font, char, include_advance=True)
             
             shaping_passed = fuzzy_equal(gf_pos, base_pos)
             shaping_detail = "" if shaping_passed else f"Shaping mismatch (GF={gf_pos} Base={base_pos})"
@@ -247,12 +328,9 @@ def fuzzy_equal(v1, v2, tol=TOLERANCE):
 
         # 2. Outline check
         try:
-            gf_gn = gf_cmap.get(cp)
-            base_gn = base_cmap.get(cp)
-            
-            if not gf_gn or not base_gn:
-                outline_passed = False
-                outline_detail = f"Glyph missing (GF={gf_gn}, Base={base_gn})"
+            if same_simple_outline(gf_tt, gf_gn, base_tt, base_gn):
+                outline_passed = True
+                outline_detail = ""
             else:
                 pen_gf = DecomposingRecordingPen(gf_glyph_set)
                 pen_base = DecomposingRecordingPen(base_glyph_set)
@@ -280,6 +358,23 @@ def fuzzy_equal(v1, v2, tol=TOLERANCE):
     return results
 
 
+@lru_cache(maxsize=None)
+def load_pil_font(font_path: str, font_size: int) -> ImageFont.FreeTypeFont:
+    """Open a font for rendering once, shared by every diff image."""
+    return ImageFont.truetype(font_path, font_size)
+
+
+@lru_cache(maxsize=None)
+def load_hb_font(font_path: str) -> hb.Font:
+    """Read a font file once and return its cached hb.Font."""
+    return get_hb_font(load_font_data(font_path))
+
+
+def shape_one(font: hb.Font, char: str) -> int:
+    """Return the shaped advance of a single character."""
+    return shape_text(font, char, include_advance=True)[0][2]
+
+
 def generate_diff_image(char: str, cp: int, gf_font_path: str, base_font_path: str, output_path: str):
     """Generate a side-by-side and overlay comparison image for a character."""
     size = 200
@@ -294,23 +389,12 @@ def generate_diff_image(char: str, cp: int, gf_font_path: str, base_font_path: s
     draw = ImageDraw.Draw(img)
     
     try:
-        gf_font = ImageFont.truetype(gf_font_path, font_size)
-        base_font = ImageFont.truetype(base_font_path, font_size)
+        gf_font = load_pil_font(gf_font_path, font_size)
+        base_font = load_pil_font(base_font_path, font_size)
         
         # Get actual advances for visual guides
-        import uharfbuzz as hb
-        def get_advance(font_path, char):
-            with open(font_path, 'rb') as f: data = f.read()
-            face = hb.Face(data)
-            font = hb.Font(face)
-            buf = hb.Buffer()
-            buf.add_str(char)
-            buf.guess_segment_properties()
-            hb.shape(font, buf)
-            return buf.glyph_positions[0].x_advance
-            
-        gf_adv = get_advance(gf_font_path, char)
-        base_adv = get_advance(base_font_path, char)
+        gf_adv = shape_one(load_hb_font(gf_font_path), char)
+        base_adv = shape_one(load_hb_font(base_font_path), char)
         
         label_font = ImageFont.load_default()
     except Exception:
@@ -389,98 +473,111 @@ def main():
         print(f"Error: Base font not found: {BASE_FONT}")
         return 1
 
-    # Load font data
-    print("\nLoading fonts...")
-    gf_data = load_font_data(GF_FONT)
-    base_data = load_font_data(BASE_FONT)
-
-    # Get combining marks
-    print("Scanning for combining marks...")
-    marks = get_combining_marks(GF_FONT)
-    base_chars = get_base_chars()
-
-    print(f"Found {len(marks)} combining marks")
-    print(f"Testing with {len(base_chars)} base characters")
-    print(f"Total combinations: {len(marks) * len(base_chars)}")
-
-    # Build test cases
-    test_cases = []
-    for base_char in base_chars:
-        for mark_cp, _ in marks:
-            test_cases.append((base_char, mark_cp, gf_data, base_data))
-
-    # Run tests in parallel
-    print(f"\nRunning tests with {os.cpu_count()} parallel workers...")
-
-    passed = 0
-    failed = 0
-    failures = []
-
-    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
-        futures = {executor.submit(test_single_combination, tc): tc for tc in test_cases}
-
-        for future in as_completed(futures):
-            text, success, detail = future.result()
+    os.makedirs(os.path.dirname(FAILURES_LOG), exist_ok=True)
+    with open(FAILURES_LOG, "w", encoding="utf-8") as failure_log:
+        # Load font data
+        print("\nLoading fonts...")
+        gf_data = load_font_data(GF_FONT)
+        base_data = load_font_data(BASE_FONT)
+
+        # Get combining marks
+        print("Scanning for combining marks...")
+        marks = get_combining_marks(gf_data)
+        base_chars = get_base_chars()
+
+        # Build one task per base character; the font data reaches each worker
+        # once via init_worker
+        test_rows = [(base_char, marks_for_base(base_char, marks)) for base_char in base_chars]
+
+        print(f"Found {len(marks)} combining marks")
+        print(f"Testing with {len(base_chars)} base characters")
+        print(f"Total combinations: {sum(len(row_marks) for _, row_marks in test_rows)}")
+
+        # Run tests in parallel
+        num_workers = get_worker_count()
+        print(f"\nRunning tests with {num_workers} parallel workers...")
+
+        passed = 0
+        failed = 0
+
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=init_worker,
+            initargs=(gf_data, base_data)
+        ) as executor:
+            for row in executor.map(test_base_row, test_rows):
+                for text, success, detail in row:
+                    if success:
+                        passed += 1
+                    else:
+                        failed += 1
+                        log_failure(failure_log, "marks", text, detail)
+
+        # Test stacked marks
+        print("\nTesting stacked mark combinations...")
+        stacked_results = test_stacked_marks(gf_data, base_data)
+        for text, success, detail in stacked_results:
             if success:
                 passed += 1
+                print(f"  ✓ {text}")
             else:
                 failed += 1
-                failures.append((text, detail))
-
-    # Test stacked marks
-    print("\nTesting stacked mark combinations...")
-    stacked_results = test_stacked_marks(gf_data, base_data)
-    for text, success, detail in stacked_results:
-        if success:
-            passed += 1
-            print(f"  ✓ {text}")
-        else:
-            failed += 1
-            failures.append((text, detail))
-            print(f"  ✗ {text}: {detail}")
+                log_failure(failure_log, "stacked", text, detail)
+                print(f"  ✗ {text}: {detail}")
 
-    elapsed = time.time() - start_time
+        elapsed = time.time() - start_time
 
-    # Summary
-    print("\n" + "=" * 70)
-    print("PHASE 2: Global Character Integrity (Shaping & Outlines)")
-    print("=" * 70)
+        # Summary
+        print("\n" + "=" * 70)
+        print("PHASE 2: Global Character Integrity (Shaping & Outlines)")
+        print("=" * 70)
     
-    # Get all Unicode characters from GF font
-    gf_cmap = TTFont(BytesIO(gf_data)).getBestCmap()
-    all_cps = sorted(gf_cmap.keys())
+        # Get all Unicode characters from GF font; both cmaps are parsed once
+        # here and workers receive the glyph names directly
+        gf_cmap = TTFont(BytesIO(gf_data), lazy=True).getBestCmap()
+        base_cmap = TTFont(BytesIO(base_data), lazy=True).getBestCmap()
+        common_glyphs = [(cp, gf_cmap[cp], base_cmap[cp]) for cp in sorted(gf_cmap) if cp in base_cmap]
+        missing_cps = sorted(set(gf_cmap) - set(base_cmap))
     
-    print(f"Testing {len(all_cps)} Unicode characters...")
+        print(f"Testing {len(gf_cmap)} Unicode characters...")
     
-    # Batch codepoints for performance
-    batch_size = 500
-    batches = [all_cps[i:i + batch_size] for i in range(0, len(all_cps), batch_size)]
+        # Batch codepoints for performance, about four batches per worker so
+        # the pool stays balanced
+        batch_size = max(50, len(common_glyphs) // (num_workers * 4))
+        batches = [common_glyphs[i:i + batch_size] for i in range(0, len(common_glyphs), batch_size)]
     
-    integrity_passed = 0
-    integrity_failed = 0
-    integrity_failures = []
-    integrity_shaping_failures = 0
-    integrity_outline_failures = 0
+        integrity_passed = 0
+        integrity_failed = 0
+        integrity_preview = []  # First 20 failures, for the summary below
+        integrity_shaping_failures = 0
+        integrity_outline_failures = 0
+
+        def record_integrity_failure(label: str, detail: str) -> None:
+            nonlocal integrity_failed
+            integrity_failed += 1
+            if len(integrity_preview) < 20:
+                integrity_preview.append((label, detail))
+            log_failure(failure_log, "integrity", label, detail)
+
+        # Codepoints the base font lacks fail without being shaped
+        for cp in missing_cps:
+            record_integrity_failure(f"U+{cp:04X} ({chr(cp)})", f"Glyph missing (GF={gf_cmap[cp]}, Base=None)")
     
-    with ProcessPoolExecutor(
-        max_workers=os.cpu_count(),
-        initializer=init_worker,
-        initargs=(gf_data, base_data)
-    ) as executor:
-        futures = {executor.submit(test_glyph_integrity_batch, batch): batch for batch in batches}
-        
-        for future in as_completed(futures):
-            batch_results = future.result()
-            for label, success, detail in batch_results:
-                if success:
-                    integrity_passed += 1
-                else:
-                    integrity_failed += 1
-                    integrity_failures.append((label, detail))
-                    if "Shaping" in detail:
-                        integrity_shaping_failures += 1
-                    if "Outline" in detail:
-                        integrity_outline_failures += 1
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=init_worker,
+            initargs=(gf_data, base_data)
+        ) as executor:
+            for batch_results in executor.map(test_glyph_integrity_batch, batches):
+                for label, success, detail in batch_results:
+                    if success:
+                        integrity_passed += 1
+                    else:
+                        record_integrity_failure(label, detail)
+                        if "Shaping" in detail:
+                            integrity_shaping_failures += 1
+                        if "Outline" in detail:
+                            integrity_outline_failures += 1
 
     # Summary
     print(f"Results: {integrity_passed} passed, {integrity_failed} failed")
@@ -488,17 +585,18 @@ def main():
         print(f"  - Shaping failures: {integrity_shaping_failures}")
         print(f"  - Outline failures: {integrity_outline_failures}")
     
-    if integrity_failures:
+    if integrity_failed:
         print(f"\nFirst 20 integrity failures:")
-        for label, detail in integrity_failures[:20]:
+        for label, detail in integrity_preview:
             print(f"  ✗ {label}: {detail}")
-        if len(integrity_failures) > 20:
-            print(f"  ... and {len(integrity_failures) - 20} more")
+        if integrity_failed > 20:
+            print(f"  ... and {integrity_failed - 20} more")
+        print(f"All failures: {FAILURES_LOG}")
             
         if generate_diffs:
-            print(f"\nGenerating diff images for all {len(integrity_failures)} failures...")
+            print(f"\nGenerating diff images for all {integrity_failed} failures...")
             # Use original paths for PIL
-            for label, _ in integrity_failures:
+            for label in iter_failure_labels(FAILURES_LOG, "integrity"):
                 # Extract codepoint from label "U+XXXX (C)"
                 try:
                     cp_str = label.split(" ")[0].replace("U+", "")